@@ -1,74 +1,95 @@
 """Dependency injection for Housekeeping."""
 
-import json
+import contextlib
+import functools
 import logging
 import os
 import shutil
+import threading
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Annotated
+
+from fastapi import Depends, Request
+from starlette.datastructures import State
 
 from ..housekeeper.engine import HousekeeperEngine
 from ..housekeeper.ha_ws import HAWebSocketClient
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    from json import loads as _json_loads
+
 logger = logging.getLogger(__name__)
 
+# The Supervisor injects these once at container start; they never change afterwards.
+_ENV_SUPERVISOR_TOKEN = os.environ.get("SUPERVISOR_TOKEN", "")
+_ENV_HASSIO_TOKEN = os.environ.get("HASSIO_TOKEN", "")
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    token: str
+    onbekend_area_name: str
+    confidence_threshold: float
+    data_dir: str
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Components:
     ha: HAWebSocketClient
     engine: HousekeeperEngine
 
 
-_components: Components | None = None
+_init_lock = threading.Lock()
 
 
+@functools.lru_cache(maxsize=1)
 def _load_options() -> dict[str, object]:
     """Load options from /data/options.json."""
     try:
         path = Path("/data/options.json")
         if path.exists():
-            with open(path, encoding="utf-8") as f:
-                return json.load(f) or {}
+            return _json_loads(path.read_bytes()) or {}
     except Exception as e:
         logger.warning("Failed to load options: %s", e)
     return {}
 
 
+@functools.lru_cache(maxsize=1)
 def _get_supervisor_token() -> str:
     """Get Supervisor token from environment or s6 container files."""
     # 1. Standard environment variable
-    token = os.environ.get("SUPERVISOR_TOKEN", "")
+    token = _ENV_SUPERVISOR_TOKEN
 
     # 2. s6-overlay container environment files
     if not token:
         for s6_dir in ["/var/run/s6/container_environment", "/run/s6/container_environment"]:
             token_file = Path(s6_dir) / "SUPERVISOR_TOKEN"
-            if token_file.exists():
-                try:
-                    token = token_file.read_text().strip()
-                    if token:
-                        logger.info("SUPERVISOR_TOKEN loaded from %s", token_file)
-                        break
-                except Exception:
-                    pass
+            # Just try the read; a missing file costs one failed open() instead of stat+open.
+            try:
+                token = token_file.read_text().strip()
+            except Exception:
+                continue
+            if token:
+                logger.info("SUPERVISOR_TOKEN loaded from %s", token_file)
+                break
 
     # 3. Legacy HASSIO_TOKEN
     if not token:
-        token = os.environ.get("HASSIO_TOKEN", "")
+        token = _ENV_HASSIO_TOKEN
 
     if not token:
         logger.error("SUPERVISOR_TOKEN not found in environment or s6 files!")
-        logger.info("Available env vars: %s", [k for k in os.environ if not k.startswith("_")])
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Available env vars: %s", [k for k in os.environ if not k.startswith("_")])
 
     return token
 
 
-def init_components() -> None:
-    """Initialize components with Supervisor authentication."""
-    global _components
-    if _components is not None:
-        return
-
+def _prepare_config() -> Config:
+    """Resolve options, Supervisor token and data directory. Caller holds _init_lock."""
     # Load options
     options = _load_options()
 
@@ -81,18 +102,7 @@ def init_components() -> None:
             "Ensure 'hassio_api: true' is set in config.json and "
             "the add-on was installed (not just rebuilt)."
         )
-        # Create dummy components that will fail gracefully
-        ha = HAWebSocketClient(url="ws://supervisor/core/websocket", token="")
-    else:
-        # Use internal Supervisor WebSocket endpoint
-        # This URL is only accessible from within the add-on container
-        ha = HAWebSocketClient(
-            url="ws://supervisor/core/websocket",
-            token=token,
-            timeout=30.0,
-        )
 
-    # Create engine
     # Prefer storing state under /config so it survives add-on uninstall/reinstall.
     data_dir = "/config/ha_housekeeping"
     os.makedirs(data_dir, exist_ok=True)
@@ -100,34 +110,91 @@ def init_components() -> None:
     # One-time best-effort migration from old /data location.
     # /data persists across updates, but not across uninstall/reinstall.
     legacy_dir = "/data"
+    # List both directories once instead of stat-ing every candidate file.
+    try:
+        legacy_names = {e.name for e in os.scandir(legacy_dir)}
+        existing_names = {e.name for e in os.scandir(data_dir)}
+    except OSError:
+        legacy_names, existing_names = set(), set()
     for name in ("plan.json", "rollback.json", "ignored.json"):
+        if name not in legacy_names or name in existing_names:
+            continue
         src = os.path.join(legacy_dir, name)
         dst = os.path.join(data_dir, name)
         try:
-            if os.path.exists(src) and not os.path.exists(dst):
-                shutil.copy2(src, dst)
-                logger.info("Migrated %s -> %s", src, dst)
+            # copy2 already copies in-kernel via sendfile(2) on Linux, with a fallback.
+            shutil.copy2(src, dst)
+            logger.info("Migrated %s -> %s", src, dst)
         except Exception as e:
+            # Don't leave a truncated file behind; it would block the retry on next start.
+            with contextlib.suppress(OSError):
+                os.unlink(dst)
             logger.warning("Failed migrating %s -> %s: %s", src, dst, e)
 
-    engine = HousekeeperEngine(
-        ha=ha,
+    return Config(
+        token=token,
         onbekend_area_name=str(options.get("onbekend_area_name", "Onbekend")),
         confidence_threshold=float(options.get("confidence_threshold", 0.9)),
         data_dir=data_dir,
     )
 
-    _components = Components(ha=ha, engine=engine)
 
-    if token:
+def _build_components(config: Config) -> Components:
+    """Create the HA client and engine. Caller holds _init_lock."""
+    if not config.token:
+        # Create dummy components that will fail gracefully
+        ha = HAWebSocketClient(url="ws://supervisor/core/websocket", token="")
+    else:
+        # Use internal Supervisor WebSocket endpoint
+        # This URL is only accessible from within the add-on container
+        ha = HAWebSocketClient(
+            url="ws://supervisor/core/websocket",
+            token=config.token,
+            timeout=30.0,
+        )
+
+    engine = HousekeeperEngine(
+        ha=ha,
+        onbekend_area_name=config.onbekend_area_name,
+        confidence_threshold=config.confidence_threshold,
+        data_dir=config.data_dir,
+    )
+
+    if config.token:
         logger.info("Components initialized with Supervisor authentication")
     else:
         logger.warning("Components initialized WITHOUT authentication - operations will fail")
+    return Components(ha=ha, engine=engine)
+
+
+def init_components(state: State) -> None:
+    """Resolve configuration at startup; the engine itself is built on first use."""
+    with _init_lock:
+        # Another caller may have finished initializing while we waited for the lock.
+        if getattr(state, "config", None) is None:
+            state.config = _prepare_config()
+
+
+def get_config(request: Request) -> Config:
+    """Get the resolved add-on configuration."""
+    config = getattr(request.app.state, "config", None)
+    if config is None:
+        init_components(request.app.state)
+        config = request.app.state.config
+    return config
+
+
+async def get_engine(request: Request) -> HousekeeperEngine:
+    """Get the engine instance, building it on first use."""
+    state = request.app.state
+    components = getattr(state, "components", None)
+    if components is None:
+        config = get_config(request)
+        with _init_lock:
+            components = getattr(state, "components", None)
+            if components is None:
+                components = state.components = _build_components(config)
+    return components.engine
 
 
-def get_engine() -> HousekeeperEngine:
-    """Get the engine instance."""
-    if _components is None:
-        init_components()
-    assert _components is not None
-    return _components.engine
+EngineDep = Annotated[HousekeeperEngine, Depends(get_engine)]
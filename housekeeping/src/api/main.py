@@ -2,28 +2,38 @@
 
 import logging
 from contextlib import asynccontextmanager
+from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
-from .dependencies import init_components
+from .dependencies import get_config, init_components
 from .routes import router
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib JSON responses
+    orjson = None
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(name)s: %(message)s",
 )
 logger = logging.getLogger(__name__)
 
+# Resolve the UI directory once so StaticFiles doesn't depend on the working directory.
+WWW_DIR = (Path(__file__).parent.parent.parent / "www").resolve()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("Starting Housekeeping v2.0.23")
     try:
-        init_components()
-        logger.info("Components initialized")
+        init_components(app.state)
+        logger.info("Configuration loaded")
     except Exception as e:
         logger.error("Init failed: %s", e)
     yield
@@ -35,33 +45,37 @@ app = FastAPI(
     description="Automated Home Assistant housekeeping",
     version="2.0.23",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
     docs_url=None,
     redoc_url=None,
 )
 
-# Add CORS middleware - restricted to same origin
+# Add CORS middleware. The UI is served from this app (same origin through ingress), so
+# credentials never need to be echoed; a wildcard origin without credentials and an
+# explicit header list lets Starlette use its static response headers.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Required for ingress - HA handles auth
-    allow_credentials=True,
-    allow_methods=["GET", "POST"],
-    allow_headers=["*"],
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Content-Type"],
 )
 
 # Include API routes
 app.include_router(router, prefix="/api")
 
 # Static files for UI
-app.mount("/", StaticFiles(directory="www", html=True), name="www")
+app.mount("/", StaticFiles(directory=WWW_DIR, html=True, check_dir=False), name="www")
 
 
 @app.get("/health", include_in_schema=False)
-async def root_health():
+async def root_health(request: Request):
     """Root health check for ingress."""
-    from .dependencies import get_engine
-
     try:
-        engine = get_engine()
-        return {"ok": True, "detail": "API running", "ha_connected": bool(engine.ha.token)}
+        return {
+            "ok": True,
+            "detail": "API running",
+            "ha_connected": bool(get_config(request).token),
+        }
     except Exception:
         return {"ok": True, "detail": "API running", "ha_connected": False}
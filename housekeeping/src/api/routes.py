@@ -1,9 +1,9 @@
 from typing import Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from pydantic import BaseModel, Field
 
-from .dependencies import get_engine
+from .dependencies import EngineDep, get_config
 
 router = APIRouter()
 
@@ -21,11 +21,10 @@ class IgnoreRequest(BaseModel):
 
 
 @router.get("/health")
-async def health() -> dict[str, Any]:
+async def health(request: Request) -> dict[str, Any]:
     """Health check."""
     try:
-        engine = get_engine()
-        has_token = bool(engine.ha.token)
+        has_token = bool(get_config(request).token)
         return {
             "ok": True,
             "detail": "API running",
@@ -40,57 +39,50 @@ async def health() -> dict[str, Any]:
 
 
 @router.get("/audit")
-async def audit() -> dict[str, Any]:
+async def audit(engine: EngineDep) -> dict[str, Any]:
     try:
-        engine = get_engine()
         return await engine.audit()
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
 
 @router.post("/plan")
-async def plan(req: PlanRequest) -> dict[str, Any]:
+async def plan(req: PlanRequest, engine: EngineDep) -> dict[str, Any]:
     try:
-        engine = get_engine()
         return await engine.plan(include_onbekend_fallback=req.include_onbekend_fallback)
     except Exception as e:
         return {"ok": False, "error": str(e), "plan": {"actions": []}}
 
 
 @router.post("/apply")
-async def apply(req: ApplyRequest) -> dict[str, Any]:
+async def apply(req: ApplyRequest, engine: EngineDep) -> dict[str, Any]:
     try:
-        engine = get_engine()
         return await engine.apply(approved_action_ids=req.approved_action_ids)
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
 
 @router.post("/rollback")
-async def rollback() -> dict[str, Any]:
+async def rollback(engine: EngineDep) -> dict[str, Any]:
     try:
-        engine = get_engine()
         return await engine.rollback()
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
 
 @router.get("/plan")
-async def get_plan() -> dict[str, Any]:
-    engine = get_engine()
+async def get_plan(engine: EngineDep) -> dict[str, Any]:
     return {"plan": engine.load_plan()}
 
 
 @router.get("/rollback")
-async def get_rollback() -> dict[str, Any]:
-    engine = get_engine()
+async def get_rollback(engine: EngineDep) -> dict[str, Any]:
     return {"rollback": engine.load_rollback()}
 
 
 @router.post("/ignore")
-async def ignore_actions(req: IgnoreRequest) -> dict[str, Any]:
+async def ignore_actions(req: IgnoreRequest, engine: EngineDep) -> dict[str, Any]:
     try:
-        engine = get_engine()
         result = engine.add_ignored(req.fingerprints)
         return {"ok": True, "ignored_count": len(result)}
     except Exception as e:
@@ -98,9 +90,8 @@ async def ignore_actions(req: IgnoreRequest) -> dict[str, Any]:
 
 
 @router.delete("/ignore")
-async def unignore_actions(req: IgnoreRequest) -> dict[str, Any]:
+async def unignore_actions(req: IgnoreRequest, engine: EngineDep) -> dict[str, Any]:
     try:
-        engine = get_engine()
         result = engine.remove_ignored(req.fingerprints)
         return {"ok": True, "ignored_count": len(result)}
     except Exception as e:
@@ -108,9 +99,8 @@ async def unignore_actions(req: IgnoreRequest) -> dict[str, Any]:
 
 
 @router.post("/ignore/clear")
-async def clear_ignored() -> dict[str, Any]:
+async def clear_ignored(engine: EngineDep) -> dict[str, Any]:
     try:
-        engine = get_engine()
         engine.clear_ignored()
         return {"ok": True, "ignored_count": 0}
     except Exception as e:
@@ -118,10 +108,9 @@ async def clear_ignored() -> dict[str, Any]:
 
 
 @router.get("/ignore")
-async def get_ignored() -> dict[str, Any]:
+async def get_ignored(engine: EngineDep) -> dict[str, Any]:
     try:
-        engine = get_engine()
-        ignored = engine.load_ignored()
+        ignored = sorted(engine.load_ignored())
         return {"ok": True, "ignored": ignored, "ignored_count": len(ignored)}
     except Exception as e:
         return {"ok": False, "error": str(e)}
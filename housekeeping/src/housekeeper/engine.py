@@ -1,55 +1,121 @@
+import asyncio
+import functools
+import hashlib
+import itertools
 import json
 import logging
+import mmap
 import os
 import re
-import uuid
+import secrets
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
 from .ha_ws import HAWebSocketClient
-from .model import Action, asdict_action
+from .model import ActionType
 from .rules import load_rules
 from .util import is_suffix_duplicate_entity, tokenize
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# A fetched + indexed registry snapshot is reused for this long, so an /audit directly
+# followed by /plan doesn't fetch and index everything twice. Writes drop it immediately.
+_INDEX_TTL_S = 1.0
+
+# Action ids: a random per-process salt plus the engine's counter keeps them unique across
+# plans without drawing randomness per action.
+_ID_SALT = secrets.token_hex(4)
+
+# apply() reuses the registry snapshot its plan was built from for this long.
+_SNAPSHOT_MAX_AGE_S = 30.0
+
+# JSON files at least this large are parsed straight from a read-only mapping.
+_MMAP_MIN_SIZE = 4096
+
+# apply() sends up to this many independent registry updates concurrently.
+_APPLY_BATCH = 32
+
 
 def _now_iso() -> str:
     return datetime.now(UTC).isoformat()
 
 
-def _is_active_state(state_obj: dict[str, Any] | None) -> bool:
-    if not state_obj:
-        return False
-    st = state_obj.get("state")
-    if st is None:
-        return False
-    return st != "unavailable"
+def _storable_fingerprint(fp: str) -> bool:
+    # ignored.txt holds one fingerprint per line, read back verbatim; anything that would not
+    # survive that round trip (line breaks, edge whitespace, empty) can't be stored.
+    if fp and fp == fp.strip() and len(fp.splitlines()) == 1:
+        return True
+    logger.warning("Fingerprint %r can't be stored in the ignore list", fp)
+    return False
+
+
+def _fingerprint(atype: str, payload: dict[str, Any]) -> str:
+    # Stable identity of an action across plans (ids are per plan); used by the ignore list.
+    key = (
+        payload.get("entity_id")
+        or payload.get("device_id")
+        or payload.get("area_id")
+        or payload.get("name")
+        or ""
+    )
+    return f"{atype}:{key}"
+
+
+def _read_json(path: str) -> Any:
+    # Counterpart of _write_json(). An empty file reads as None.
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return None
+        if orjson is None:
+            return json.loads(f.read())
+        if size < _MMAP_MIN_SIZE:
+            return orjson.loads(f.read())
+        # Large plans/rollbacks: let orjson parse the page cache directly, no read() copy.
+        with (
+            mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm,
+            memoryview(mm) as view,
+        ):
+            return orjson.loads(view)
+
+
+def _write_json(path: str, obj: Any) -> None:
+    # Encode fully first, then hand the file one write: json.dump() writes chunk by chunk, and
+    # an encoding error would otherwise leave a truncated file behind.
+    if orjson is not None:
+        opts = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        data = orjson.dumps(obj, option=opts)
+        with open(path, "wb") as f:
+            f.write(data)
+        return
+    text = json.dumps(obj, indent=2, sort_keys=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
 
 
 def _effective_area_id(
     entity_reg: dict[str, Any],
-    device_by_id: dict[str, Any],
+    device_area_by_id: dict[str, str | None],
 ) -> str | None:
     # Effective area = entity.area_id if set; else device.area_id if linked.
-    area_id = entity_reg.get("area_id")
-    if area_id:
-        return area_id
-    device_id = entity_reg.get("device_id")
-    if not device_id:
-        return None
-    return device_by_id.get(device_id, {}).get("area_id")
+    return entity_reg.get("area_id") or device_area_by_id.get(entity_reg.get("device_id"))
 
 
 def _normalize_name(s: str) -> str:
     return (s or "").strip().lower()
 
 
-def _looks_generic_media_name(name: str) -> bool:
-    n = _normalize_name(name)
-    if not n:
-        return True
-    generic = {
+_GENERIC_MEDIA_NAMES: frozenset[str] = frozenset(
+    {
         "tv",
         "speaker",
         "speakers",
@@ -64,7 +130,14 @@ def _looks_generic_media_name(name: str) -> bool:
         "default",
         "unknown",
     }
-    return n in generic or n.startswith("media player")
+)
+
+
+def _looks_generic_media_name(name: str) -> bool:
+    n = _normalize_name(name)
+    if not n:
+        return True
+    return n in _GENERIC_MEDIA_NAMES or n.startswith("media player")
 
 
 def _media_base_label(entity_id: str, friendly: str) -> str:
@@ -80,11 +153,243 @@ def _media_base_label(entity_id: str, friendly: str) -> str:
     return "Media"
 
 
+def _token_mask(tokens: frozenset[str]) -> int:
+    # 64-bit Bloom-style signature: if a's mask isn't contained in b's, a can't be a subset of b.
+    mask = 0
+    for tok in tokens:
+        mask |= 1 << (hash(tok) & 63)
+    return mask
+
+
 def _is_hidden_or_disabled(entity_reg: dict[str, Any]) -> bool:
     # HA registry marks "hidden" via hidden_by and/or disabled_by depending on version/features.
     return bool(entity_reg.get("hidden_by") or entity_reg.get("disabled_by"))
 
 
+@dataclass(frozen=True, slots=True)
+class _EntityRow:
+    # The entity registry fields the planning passes read, pulled out of the raw dict once.
+    entity_id: str | None
+    device_id: str | None
+    area_id: str | None
+    unique_id: str | None
+    name: str | None
+    original_name: str | None
+    hidden: bool
+    effective_area_id: str | None
+
+
+def _entity_rows(
+    entities: list[dict[str, Any]],
+    device_area_by_id: dict[str, str | None],
+) -> list[_EntityRow]:
+    return [
+        _EntityRow(
+            entity_id=er.get("entity_id"),
+            device_id=er.get("device_id"),
+            area_id=er.get("area_id"),
+            unique_id=er.get("unique_id"),
+            name=er.get("name"),
+            original_name=er.get("original_name"),
+            hidden=_is_hidden_or_disabled(er),
+            effective_area_id=_effective_area_id(er, device_area_by_id),
+        )
+        for er in entities
+    ]
+
+
+def _active_entities(
+    rows: list[_EntityRow],
+    states_by_entity_id: dict[str, Any],
+) -> dict[str, tuple[_EntityRow, dict[str, Any]]]:
+    # entity_id -> (registry row, state) for entities with a state that isn't unavailable.
+    # Built once per audit/plan so the individual passes don't repeat the state lookup.
+    active: dict[str, tuple[_EntityRow, dict[str, Any]]] = {}
+    for row in rows:
+        entity_id = row.entity_id
+        if not entity_id:
+            continue
+        st = states_by_entity_id.get(entity_id)
+        if st and st.get("state") not in (None, "unavailable"):
+            active[entity_id] = (row, st)
+    return active
+
+
+@dataclass(frozen=True, slots=True)
+class _RegexRule:
+    rx: re.Pattern
+    pattern: str
+    requires_approval: bool
+    overwrite: bool = False
+    area_name: str = ""
+    area_id: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _Registry:
+    # Raw registry lists plus the by-key lookups apply() needs for its rollback snapshot.
+    areas: list[dict[str, Any]]
+    devices: list[dict[str, Any]]
+    entities: list[dict[str, Any]]
+    entity_by_id: dict[str, dict[str, Any]]
+    device_by_id: dict[str, dict[str, Any]]
+    area_by_id: dict[str, dict[str, Any]]
+    area_by_name: dict[str, dict[str, Any]]
+    fetched_at: float
+
+
+@dataclass(slots=True)
+class _ApplyRun:
+    # State of one apply() call, shared by the per-action-type handlers.
+    registry: _Registry
+    rollback_steps: list[dict[str, Any]] = field(default_factory=list)
+    applied: list[str] = field(default_factory=list)
+    skipped: list[dict[str, Any]] = field(default_factory=list)
+    # Plain registry updates are queued and sent in concurrent batches. A batch never touches
+    # the same registry entry twice, and is flushed before any action that must run on its
+    # own, so HA sees the updates in plan order.
+    batch: list[tuple[str, Callable[[], Awaitable[Any]]]] = field(default_factory=list)
+    batch_keys: set[str] = field(default_factory=set)
+
+    async def flush(self) -> None:
+        if not self.batch:
+            return
+        results = await asyncio.gather(*(call() for _, call in self.batch), return_exceptions=True)
+        for (aid, _), res in zip(self.batch, results, strict=True):
+            if isinstance(res, BaseException):
+                logger.warning("Action %s failed: %s", aid, res)
+                self.skipped.append({"id": aid, "reason": f"failed: {res}"})
+            else:
+                self.applied.append(aid)
+        self.batch.clear()
+        self.batch_keys.clear()
+
+    async def queue(self, aid: str, key: str, call: Callable[[], Awaitable[Any]]) -> None:
+        if key in self.batch_keys or len(self.batch) >= _APPLY_BATCH:
+            await self.flush()
+        self.batch.append((aid, call))
+        self.batch_keys.add(key)
+
+
+@dataclass(frozen=True)
+class _Index:
+    registry: _Registry
+    areas: list[dict[str, Any]]
+    devices: list[dict[str, Any]]
+    entities: list[dict[str, Any]]
+    row_by_id: dict[str, _EntityRow]
+    active: dict[str, tuple[_EntityRow, dict[str, Any]]]
+    active_by_domain: defaultdict[str, list[str]]
+    active_helper_ids: list[str]
+    entity_ids: set[str]
+    device_area_by_id: dict[str, str | None]
+    entities_by_device_id: defaultdict[str, list[_EntityRow]]
+    by_unique_id: defaultdict[str, list[str]]
+    suffix_dupes: list[tuple[str, str]]
+    area_lower_by_id: dict[str, str]
+    area_id_by_name_lower: dict[str, str]
+    areas_by_name_lower: defaultdict[str, list[dict[str, Any]]]
+    area_tokens: list[tuple[str, str, frozenset[str], int]]
+    areas_by_token: dict[str, list[int]]
+
+
+def _build_index(d: dict[str, Any]) -> _Index:
+    # Lookup structures shared by audit() and plan().
+    areas = d["areas"]
+    devices = d["devices"]
+    entities = d["entities"]
+    device_area_by_id = {dv["id"]: dv.get("area_id") for dv in devices if dv.get("id")}
+    rows = _entity_rows(entities, device_area_by_id)
+
+    entities_by_device_id: defaultdict[str, list[_EntityRow]] = defaultdict(list)
+    by_unique_id: defaultdict[str, list[str]] = defaultdict(list)
+    row_by_id: dict[str, _EntityRow] = {}
+    for row in rows:
+        did = row.device_id
+        if did:
+            entities_by_device_id[did].append(row)
+        uid = row.unique_id
+        eid = row.entity_id
+        if eid:
+            row_by_id[eid] = row
+            if uid:
+                by_unique_id[uid].append(eid)
+
+    active = _active_entities(rows, d["states_by_entity_id"])
+    # Active entity ids bucketed by domain (in registry order), so per-domain passes don't
+    # scan every entity. Helper-like domains are also collected together in one ordered list.
+    active_by_domain: defaultdict[str, list[str]] = defaultdict(list)
+    active_helper_ids = []
+    for eid in active:
+        dom = eid.split(".", 1)[0]
+        active_by_domain[dom].append(eid)
+        if dom in ("sensor", "template") or dom.startswith("input_"):
+            active_helper_ids.append(eid)
+
+    # Normalize each area name once; the case-insensitive lookups below all derive from it.
+    area_lower_by_id: dict[str, str] = {}
+    areas_by_name_lower: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    for a in areas:
+        nm = a.get("name")
+        if not nm:
+            continue
+        lower = _normalize_name(str(nm))
+        areas_by_name_lower[lower].append(a)
+        if a.get("area_id"):
+            area_lower_by_id[a["area_id"]] = lower
+
+    # (entity_id, base_entity_id) for ids like "light.x_2" whose base "light.x" also exists.
+    entity_ids = set(row_by_id)
+    suffix_dupes = []
+    for row in rows:
+        eid = row.entity_id
+        if not eid:
+            continue
+        is_dup, base = is_suffix_duplicate_entity(eid)
+        if is_dup and base in entity_ids:
+            suffix_dupes.append((eid, base))
+
+    area_tokens = []
+    for a in areas:
+        if not a.get("area_id") or not a.get("name"):
+            continue
+        at = frozenset(tokenize(a["name"]))
+        area_tokens.append((a["area_id"], a["name"], at, _token_mask(at)))
+
+    # Inverted index for token matching: each area is listed under its rarest token, so an
+    # entity only needs a subset test against areas whose rarest token it contains.
+    token_freq: dict[str, int] = {}
+    for _, _, at, _ in area_tokens:
+        for tok in at:
+            token_freq[tok] = token_freq.get(tok, 0) + 1
+    areas_by_token: dict[str, list[int]] = {}
+    for idx, (_, _, at, _) in enumerate(area_tokens):
+        if at:
+            rarest = min(at, key=lambda t: (token_freq[t], t))
+            areas_by_token.setdefault(rarest, []).append(idx)
+
+    return _Index(
+        registry=d["registry"],
+        areas=areas,
+        devices=devices,
+        entities=entities,
+        row_by_id=row_by_id,
+        active=active,
+        active_by_domain=active_by_domain,
+        active_helper_ids=active_helper_ids,
+        entity_ids=entity_ids,
+        device_area_by_id=device_area_by_id,
+        entities_by_device_id=entities_by_device_id,
+        by_unique_id=by_unique_id,
+        suffix_dupes=suffix_dupes,
+        area_lower_by_id=area_lower_by_id,
+        area_id_by_name_lower={lower: aid for aid, lower in area_lower_by_id.items()},
+        areas_by_name_lower=areas_by_name_lower,
+        area_tokens=area_tokens,
+        areas_by_token=areas_by_token,
+    )
+
+
 class HousekeeperEngine:
     def __init__(
         self,
@@ -101,8 +406,41 @@ class HousekeeperEngine:
         os.makedirs(self.data_dir, exist_ok=True)
         self.plan_path = os.path.join(self.data_dir, "plan.json")
         self.rollback_path = os.path.join(self.data_dir, "rollback.json")
-        self.ignored_path = os.path.join(self.data_dir, "ignored.json")
+        # One fingerprint per line, so /ignore can append instead of rewriting.
+        self.ignored_path = os.path.join(self.data_dir, "ignored.txt")
         self.rules_path = os.environ.get("HOUSEKEEPER_RULES_PATH")
+        self._index_cache: tuple[float, _Index] | None = None
+        self._registry_cache: tuple[float, _Registry] | None = None
+        # (registry, snapshot_digest) of the last plan, for apply() to pick up.
+        self._last_snapshot: tuple[_Registry, str] | None = None
+        self._id_counter = itertools.count()
+        # apply() dispatch: action type -> handler(run, action_id, payload).
+        self._apply_handlers: dict[
+            str, Callable[[_ApplyRun, str, dict[str, Any]], Awaitable[None]]
+        ] = {
+            "create_area": self._apply_create_area,
+            "set_entity_area": self._apply_set_entity_area,
+            "set_device_area": self._apply_set_device_area,
+            "rename_entity": self._apply_rename_entity,
+            "hide_entity": self._apply_hide_entity,
+            "remove_entity_registry_entry": self._apply_remove_entity,
+            "rename_device": self._apply_rename_device,
+            "rename_area": self._apply_rename_area,
+        }
+        # Parsed ignored.txt, keyed by the file's (st_mtime_ns, st_size).
+        self._ignored_cache: tuple[tuple[int, int], frozenset[str]] | None = None
+        self._migrate_ignored_json()
+
+    def _migrate_ignored_json(self) -> None:
+        """Convert a legacy ignored.json (JSON list) to ignored.txt once."""
+        legacy = os.path.join(self.data_dir, "ignored.json")
+        if os.path.exists(self.ignored_path) or not os.path.exists(legacy):
+            return
+        try:
+            self.save_ignored(str(fp) for fp in _read_json(legacy) or ())
+            logger.info("Migrated %s -> %s", legacy, self.ignored_path)
+        except Exception as e:
+            logger.warning("Failed migrating %s -> %s: %s", legacy, self.ignored_path, e)
 
     def _load_rules(self) -> tuple[dict[str, Any], dict[str, Any]]:
         return load_rules(self.rules_path)
@@ -114,6 +452,55 @@ class HousekeeperEngine:
         except Exception:
             return None
 
+    @staticmethod
+    def _union_regex(rxs: list[re.Pattern]) -> re.Pattern | None:
+        # One alternation of all rule patterns, used to pre-filter ids in a single pass before
+        # the per-rule matching. Patterns with groups are left alone: joining them would
+        # renumber backreferences.
+        if not rxs or any(rx.groups for rx in rxs):
+            return None
+        try:
+            return re.compile("|".join(f"(?:{rx.pattern})" for rx in rxs), flags=re.IGNORECASE)
+        except Exception:
+            return None
+
+    def _prepare_regex_rules(
+        self,
+        raw: Any,
+        area_id_by_name_lower: dict[str, str] | None = None,
+    ) -> list[_RegexRule]:
+        # Validate regex rules once. With area_id_by_name_lower, rules also need an "area" that
+        # resolves to an existing area (entity_area / device_area rules).
+        out: list[_RegexRule] = []
+        for rr in raw or []:
+            if not isinstance(rr, dict):
+                continue
+            pat = str(rr.get("pattern") or "")
+            area_name = ""
+            if area_id_by_name_lower is not None:
+                area_name = str(rr.get("area") or "").strip()
+                if not pat or not area_name:
+                    continue
+            rx = self._compile_regex(pat)
+            if not rx:
+                continue
+            area_id = None
+            if area_id_by_name_lower is not None:
+                area_id = area_id_by_name_lower.get(area_name.lower())
+                if not area_id:
+                    continue
+            out.append(
+                _RegexRule(
+                    rx=rx,
+                    pattern=pat,
+                    requires_approval=bool(rr.get("requires_approval", True)),
+                    overwrite=bool(rr.get("overwrite", False)),
+                    area_name=area_name,
+                    area_id=area_id,
+                )
+            )
+        return out
+
     async def health(self) -> tuple[bool, dict[str, Any]]:
         try:
             await self.ha.connect()
@@ -121,42 +508,70 @@ class HousekeeperEngine:
         except Exception as e:
             return False, {"error": str(e), "ha_ws_url": self.ha.url}
 
+    async def _registry(self) -> _Registry:
+        # Same TTL as the index: a /plan directly followed by /apply reuses one fetch.
+        cached = self._registry_cache
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < _INDEX_TTL_S:
+            return cached[1]
+        # Independent requests; the client pipelines them over its single connection.
+        areas, devices, entities = await asyncio.gather(
+            self.ha.area_list(), self.ha.device_list(), self.ha.entity_list()
+        )
+        registry = _Registry(
+            areas=areas,
+            devices=devices,
+            entities=entities,
+            entity_by_id={e["entity_id"]: e for e in entities if e.get("entity_id")},
+            device_by_id={d["id"]: d for d in devices if d.get("id")},
+            area_by_id={a["area_id"]: a for a in areas if a.get("area_id")},
+            area_by_name={a["name"]: a for a in areas if a.get("name")},
+            fetched_at=now,
+        )
+        self._registry_cache = (now, registry)
+        return registry
+
+    def _invalidate_snapshots(self) -> None:
+        # The registry is being written to; later reads must fetch again.
+        self._index_cache = None
+        self._registry_cache = None
+        self._last_snapshot = None
+
     async def _fetch(self) -> dict[str, Any]:
-        areas = await self.ha.area_list()
-        devices = await self.ha.device_list()
-        entities = await self.ha.entity_list()
-        states = await self.ha.get_states()
+        registry, states = await asyncio.gather(self._registry(), self.ha.get_states())
 
         states_by_entity_id = {s.get("entity_id"): s for s in states if s.get("entity_id")}
 
         return {
-            "areas": areas,
-            "devices": devices,
-            "entities": entities,
+            "registry": registry,
+            "areas": registry.areas,
+            "devices": registry.devices,
+            "entities": registry.entities,
             "states_by_entity_id": states_by_entity_id,
         }
 
+    async def _indexed(self) -> _Index:
+        cached = self._index_cache
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < _INDEX_TTL_S:
+            return cached[1]
+        index = _build_index(await self._fetch())
+        self._index_cache = (now, index)
+        return index
+
     async def audit(self) -> dict[str, Any]:
-        d = await self._fetch()
+        ix = await self._indexed()
 
-        areas = d["areas"]
-        devices = d["devices"]
-        entities = d["entities"]
-        states_by_entity_id = d["states_by_entity_id"]
+        areas = ix.areas
+        devices = ix.devices
+        entities = ix.entities
+        active = ix.active
 
         area_name_by_id = {a.get("area_id"): a.get("name") for a in areas if a.get("area_id")}
         area_id_by_name = {
             a.get("name"): a.get("area_id") for a in areas if a.get("name") and a.get("area_id")
         }
 
-        device_by_id = {dv.get("id"): dv for dv in devices if dv.get("id")}
-        entities_by_device_id: dict[str, list[dict[str, Any]]] = {}
-        for er in entities:
-            did = er.get("device_id")
-            if not did:
-                continue
-            entities_by_device_id.setdefault(did, []).append(er)
-
         devices_without_area = []
         for dv in devices:
             if not dv.get("area_id"):
@@ -168,55 +583,31 @@ class HousekeeperEngine:
                 )
 
         entities_without_effective_area = []
-        for er in entities:
-            entity_id = er.get("entity_id")
-            if not entity_id:
-                continue
-            st = states_by_entity_id.get(entity_id)
-            if not _is_active_state(st):
-                continue
-            if not _effective_area_id(er, device_by_id):
-                device_id = er.get("device_id")
+        for entity_id, (row, _st) in active.items():
+            if not row.effective_area_id:
                 entities_without_effective_area.append(
                     {
                         "entity_id": entity_id,
-                        "name": er.get("name") or er.get("original_name") or "",
-                        "device_id": device_id,
+                        "name": row.name or row.original_name or "",
+                        "device_id": row.device_id,
                     }
                 )
 
-        entity_ids = {e.get("entity_id") for e in entities if e.get("entity_id")}
-        suffix_dupes = []
-        for er in entities:
-            entity_id = er.get("entity_id")
-            if not entity_id:
-                continue
-            is_dup, base = is_suffix_duplicate_entity(entity_id)
-            if is_dup and base in entity_ids:
-                suffix_dupes.append({"entity_id": entity_id, "base_entity_id": base})
+        suffix_dupes = [
+            {"entity_id": entity_id, "base_entity_id": base} for entity_id, base in ix.suffix_dupes
+        ]
 
         unique_id_dupes = []
-        by_unique_id: dict[str, list[str]] = {}
-        for er in entities:
-            uid = er.get("unique_id")
-            eid = er.get("entity_id")
-            if uid and eid:
-                by_unique_id.setdefault(uid, []).append(eid)
-        for uid, eids in by_unique_id.items():
+        for uid, eids in ix.by_unique_id.items():
             if len(eids) > 1:
                 unique_id_dupes.append({"unique_id": uid, "entity_ids": sorted(eids)})
 
         generic_media = []
-        for er in entities:
-            entity_id = er.get("entity_id")
-            if not entity_id or not entity_id.startswith("media_player."):
-                continue
-            st = states_by_entity_id.get(entity_id)
-            if not _is_active_state(st):
-                continue
+        for entity_id in ix.active_by_domain["media_player"]:
+            row, st = active[entity_id]
             friendly = (
-                er.get("name")
-                or er.get("original_name")
+                row.name
+                or row.original_name
                 or str((st.get("attributes") or {}).get("friendly_name") or "")
             )
             if _looks_generic_media_name(friendly):
@@ -224,25 +615,17 @@ class HousekeeperEngine:
                     {
                         "entity_id": entity_id,
                         "current_name": friendly,
-                        "effective_area_id": _effective_area_id(er, device_by_id),
+                        "effective_area_id": row.effective_area_id,
                     }
                 )
 
-        helpers = []
-        for er in entities:
-            entity_id = er.get("entity_id") or ""
-            if not (
-                entity_id.startswith("input_")
-                or entity_id.startswith("sensor.")
-                or entity_id.startswith("template.")
-            ):
-                continue
-            st = states_by_entity_id.get(entity_id)
-            if not _is_active_state(st):
-                continue
-            helpers.append(
-                {"entity_id": entity_id, "effective_area_id": _effective_area_id(er, device_by_id)}
-            )
+        helpers = [
+            {
+                "entity_id": entity_id,
+                "effective_area_id": active[entity_id][0].effective_area_id,
+            }
+            for entity_id in ix.active_helper_ids
+        ]
 
         return {
             "generated_at": _now_iso(),
@@ -267,44 +650,78 @@ class HousekeeperEngine:
         }
 
     async def plan(self, include_onbekend_fallback: bool) -> dict[str, Any]:
-        d = await self._fetch()
-        areas = d["areas"]
-        devices = d["devices"]
-        entities = d["entities"]
-        states_by_entity_id = d["states_by_entity_id"]
+        ix = await self._indexed()
+        areas = ix.areas
+        devices = ix.devices
+        active = ix.active
+        device_area_by_id = ix.device_area_by_id
+        entities_by_device_id = ix.entities_by_device_id
+        area_tokens = ix.area_tokens
+        areas_by_token = ix.areas_by_token
+        area_id_by_name_lower = ix.area_id_by_name_lower
 
         rules, rules_meta = self._load_rules()
 
-        area_tokens = []
-        area_names = set()
+        id_counter = self._id_counter
+
+        def _aid() -> str:
+            return f"{_ID_SALT}-{next(id_counter):012x}"
+
+        # Actions go straight into plan.json, so build the serialized dict form directly
+        # (same keys as asdict_action) instead of Action instances converted afterwards.
+        # Each one carries its ignore-list fingerprint so filtering needs no second pass.
+        def _mk(
+            type_: ActionType,
+            payload: dict[str, Any],
+            reason: str,
+            confidence: float,
+            requires_approval: bool,
+        ) -> tuple[dict[str, Any], str]:
+            action = {
+                "id": _aid(),
+                "type": type_,
+                "payload": payload,
+                "reason": reason,
+                "confidence": confidence,
+                "requires_approval": requires_approval,
+            }
+            return action, _fingerprint(type_, payload)
+
+        # Per-plan tokenize memo for friendly names, which repeat across entities.
+        tok_cache: dict[str, frozenset[str]] = {}
+
+        def _tok(text: str) -> frozenset[str]:
+            toks = tok_cache.get(text)
+            if toks is None:
+                toks = tok_cache[text] = frozenset(tokenize(text))
+            return toks
+
+        # Tokens of entity_id + registry names, shared by the token-match and helper passes.
+        entity_tokens: dict[str, frozenset[str]] = {}
+
+        def _entity_tok(entity_id: str, row: _EntityRow) -> frozenset[str]:
+            toks = entity_tokens.get(entity_id)
+            if toks is None:
+                hay = " ".join([entity_id, str(row.name or ""), str(row.original_name or "")])
+                # hay starts with the unique entity_id, so memoizing it in tok_cache never hits.
+                toks = entity_tokens[entity_id] = frozenset(tokenize(hay))
+            return toks
+
+        area_id_by_name: dict[str, str] = {}
         area_name_by_id = {}
         for a in areas:
             if not a.get("area_id") or not a.get("name"):
                 continue
-            area_names.add(a["name"])
+            area_id_by_name.setdefault(a["name"], a["area_id"])
             area_name_by_id[a["area_id"]] = a["name"]
-            area_tokens.append((a["area_id"], a["name"], tokenize(a["name"])))
-
-        device_by_id = {dv.get("id"): dv for dv in devices if dv.get("id")}
-        entities_by_device_id: dict[str, list[dict[str, Any]]] = {}
-        for er in entities:
-            did = er.get("device_id")
-            if not did:
-                continue
-            entities_by_device_id.setdefault(did, []).append(er)
 
-        actions: list[Action] = []
+        actions: list[tuple[dict[str, Any], str]] = []
         planned_entity_area: set[str] = set()
         planned_entity_remove: set[str] = set()
         planned_entity_hide: set[str] = set()
 
         # Area renames from rules.
-        area_by_name_ci: dict[str, list[dict[str, Any]]] = {}
-        for a in areas:
-            nm = a.get("name")
-            if not nm:
-                continue
-            area_by_name_ci.setdefault(str(nm).strip().lower(), []).append(a)
+        area_by_name_ci = ix.areas_by_name_lower
 
         for r in rules.get("area_renames", []) or []:
             if not isinstance(r, dict):
@@ -325,9 +742,8 @@ class HousekeeperEngine:
             if not area_id:
                 continue
             actions.append(
-                Action(
-                    id=str(uuid.uuid4()),
-                    type="rename_area",
+                _mk(
+                    type_="rename_area",
                     payload={"area_id": area_id, "name": dst},
                     reason=f"Rule: rename area '{src}' -> '{dst}'.",
                     confidence=0.9,
@@ -336,8 +752,10 @@ class HousekeeperEngine:
             )
 
         # Explicit entity removals/hides from rules.
-        entity_ids = {e.get("entity_id") for e in entities if e.get("entity_id")}
-        entity_reg_by_id = {e.get("entity_id"): e for e in entities if e.get("entity_id")}
+        entity_ids = ix.entity_ids
+        row_by_id = ix.row_by_id
+        # Sorted once; the regex rule passes below walk it in a stable order.
+        sorted_entity_ids = sorted(x for x in entity_ids if isinstance(x, str))
 
         erem = rules.get("entity_remove", {}) or {}
         for eid in erem.get("ids", []) or []:
@@ -345,9 +763,8 @@ class HousekeeperEngine:
                 continue
             if eid in entity_ids and eid not in planned_entity_remove:
                 actions.append(
-                    Action(
-                        id=str(uuid.uuid4()),
-                        type="remove_entity_registry_entry",
+                    _mk(
+                        type_="remove_entity_registry_entry",
                         payload={"entity_id": eid},
                         reason="Rule: explicit entity removal.",
                         confidence=1.0,
@@ -356,22 +773,20 @@ class HousekeeperEngine:
                 )
                 planned_entity_remove.add(eid)
 
-        for rr in erem.get("regex", []) or []:
-            if not isinstance(rr, dict):
-                continue
-            pat = str(rr.get("pattern") or "")
-            rx = self._compile_regex(pat)
-            if not rx:
-                continue
-            req = bool(rr.get("requires_approval", True))
-            for eid in sorted([x for x in entity_ids if isinstance(x, str)]):
+        remove_rules = self._prepare_regex_rules(erem.get("regex"))
+        union = self._union_regex([r.rx for r in remove_rules])
+        candidates = (
+            [eid for eid in sorted_entity_ids if union.search(eid)] if union else sorted_entity_ids
+        )
+        for rule in remove_rules:
+            rx, pat, req = rule.rx, rule.pattern, rule.requires_approval
+            for eid in candidates:
                 if eid in planned_entity_remove:
                     continue
                 if rx.search(eid):
                     actions.append(
-                        Action(
-                            id=str(uuid.uuid4()),
-                            type="remove_entity_registry_entry",
+                        _mk(
+                            type_="remove_entity_registry_entry",
                             payload={"entity_id": eid},
                             reason=f"Rule: entity_id matches /{pat}/.",
                             confidence=0.95,
@@ -384,13 +799,13 @@ class HousekeeperEngine:
         for eid in ehide.get("ids", []) or []:
             if not isinstance(eid, str):
                 continue
-            if _is_hidden_or_disabled(entity_reg_by_id.get(eid, {})):
+            row = row_by_id.get(eid)
+            if row is not None and row.hidden:
                 continue
             if eid in entity_ids and eid not in planned_entity_hide:
                 actions.append(
-                    Action(
-                        id=str(uuid.uuid4()),
-                        type="hide_entity",
+                    _mk(
+                        type_="hide_entity",
                         payload={"entity_id": eid, "hidden_by": "user"},
                         reason="Rule: explicit entity hide.",
                         confidence=1.0,
@@ -399,24 +814,23 @@ class HousekeeperEngine:
                 )
                 planned_entity_hide.add(eid)
 
-        for rr in ehide.get("regex", []) or []:
-            if not isinstance(rr, dict):
-                continue
-            pat = str(rr.get("pattern") or "")
-            rx = self._compile_regex(pat)
-            if not rx:
-                continue
-            req = bool(rr.get("requires_approval", True))
-            for eid in sorted([x for x in entity_ids if isinstance(x, str)]):
+        hide_rules = self._prepare_regex_rules(ehide.get("regex"))
+        union = self._union_regex([r.rx for r in hide_rules])
+        candidates = (
+            [eid for eid in sorted_entity_ids if union.search(eid)] if union else sorted_entity_ids
+        )
+        for rule in hide_rules:
+            rx, pat, req = rule.rx, rule.pattern, rule.requires_approval
+            for eid in candidates:
                 if eid in planned_entity_hide:
                     continue
-                if _is_hidden_or_disabled(entity_reg_by_id.get(eid, {})):
+                row = row_by_id.get(eid)
+                if row is not None and row.hidden:
                     continue
                 if rx.search(eid):
                     actions.append(
-                        Action(
-                            id=str(uuid.uuid4()),
-                            type="hide_entity",
+                        _mk(
+                            type_="hide_entity",
                             payload={"entity_id": eid, "hidden_by": "user"},
                             reason=f"Rule: entity_id matches /{pat}/.",
                             confidence=0.95,
@@ -426,27 +840,20 @@ class HousekeeperEngine:
                     planned_entity_hide.add(eid)
 
         # Entities: if device has area and entity has none -> set entity area (deterministic).
-        for er in entities:
-            entity_id = er.get("entity_id")
-            if not entity_id:
-                continue
+        for entity_id, (row, _st) in active.items():
             if entity_id in planned_entity_remove:
                 continue
-            st = states_by_entity_id.get(entity_id)
-            if not _is_active_state(st):
-                continue
-            if er.get("area_id"):
+            if row.area_id:
                 continue
-            device_id = er.get("device_id")
+            device_id = row.device_id
             if not device_id:
                 continue
-            device_area_id = device_by_id.get(device_id, {}).get("area_id")
+            device_area_id = device_area_by_id.get(device_id)
             if not device_area_id:
                 continue
             actions.append(
-                Action(
-                    id=str(uuid.uuid4()),
-                    type="set_entity_area",
+                _mk(
+                    type_="set_entity_area",
                     payload={"entity_id": entity_id, "area_id": device_area_id},
                     reason="Entity has no area_id; device has area_id, so entity can inherit deterministically.",
                     confidence=1.0,
@@ -462,22 +869,17 @@ class HousekeeperEngine:
                 continue
             linked = entities_by_device_id.get(device_id) or []
             effective_area_ids = set()
-            for er in linked:
-                eid = er.get("entity_id")
-                if not eid:
-                    continue
-                st = states_by_entity_id.get(eid)
-                if not _is_active_state(st):
+            for row in linked:
+                if row.entity_id not in active:
                     continue
                 # Use entity explicit area only here (avoid circular inference from the same device).
-                if er.get("area_id"):
-                    effective_area_ids.add(er.get("area_id"))
+                if row.area_id:
+                    effective_area_ids.add(row.area_id)
             if len(effective_area_ids) == 1:
                 area_id = next(iter(effective_area_ids))
                 actions.append(
-                    Action(
-                        id=str(uuid.uuid4()),
-                        type="set_device_area",
+                    _mk(
+                        type_="set_device_area",
                         payload={"device_id": device_id, "area_id": area_id},
                         reason="Device has no area_id; all linked active entities have exactly 1 explicit area_id.",
                         confidence=0.98,
@@ -485,45 +887,42 @@ class HousekeeperEngine:
                     )
                 )
 
-        needs_fallback_onbekend = False
+        # Active entities left without any effective area after token matching.
+        fallback_candidates: list[str] = []
 
         # Entities without effective area: try token-match to a single area.
-        for er in entities:
-            entity_id = er.get("entity_id")
-            if not entity_id:
-                continue
+        for entity_id, (row, st) in active.items():
             if entity_id in planned_entity_area:
                 continue
             if entity_id in planned_entity_remove:
                 continue
-            st = states_by_entity_id.get(entity_id)
-            if not _is_active_state(st):
-                continue
-            if er.get("area_id"):
-                continue
-            device_id = er.get("device_id")
-            if device_id and device_by_id.get(device_id, {}).get("area_id"):
-                continue
-
-            hay = " ".join(
-                [
-                    entity_id,
-                    str(er.get("name") or ""),
-                    str(er.get("original_name") or ""),
-                    str((st.get("attributes") or {}).get("friendly_name") or ""),
-                ]
-            )
-            ht = tokenize(hay)
-            matches = []
-            for area_id, area_name, at in area_tokens:
-                if at and at <= ht:
-                    matches.append((area_id, area_name))
-            if len(matches) == 1:
-                area_id, area_name = matches[0]
+            if row.effective_area_id:
+                continue
+
+            ht = _entity_tok(entity_id, row)
+            friendly = str((st.get("attributes") or {}).get("friendly_name") or "")
+            if friendly:
+                ht = ht | _tok(friendly)
+            ht_mask = _token_mask(ht)
+            # Only an unambiguous match counts, so stop at the second hit.
+            found = None
+            ambiguous = False
+            for tok in ht:
+                for idx in areas_by_token.get(tok, ()):
+                    area_id, area_name, at, area_mask = area_tokens[idx]
+                    if (area_mask & ht_mask) != area_mask or not at <= ht:
+                        continue
+                    if found is not None:
+                        ambiguous = True
+                        break
+                    found = (area_id, area_name)
+                if ambiguous:
+                    break
+            if found is not None and not ambiguous:
+                area_id, area_name = found
                 actions.append(
-                    Action(
-                        id=str(uuid.uuid4()),
-                        type="set_entity_area",
+                    _mk(
+                        type_="set_entity_area",
                         payload={"entity_id": entity_id, "area_id": area_id},
                         reason=f"Token match to area name '{area_name}' from entity metadata.",
                         confidence=0.95,
@@ -532,17 +931,16 @@ class HousekeeperEngine:
                 )
                 planned_entity_area.add(entity_id)
             elif include_onbekend_fallback:
-                needs_fallback_onbekend = True
+                fallback_candidates.append(entity_id)
 
         if (
             include_onbekend_fallback
-            and needs_fallback_onbekend
-            and (self.onbekend_area_name not in area_names)
+            and fallback_candidates
+            and (self.onbekend_area_name not in area_id_by_name)
         ):
             actions.append(
-                Action(
-                    id=str(uuid.uuid4()),
-                    type="create_area",
+                _mk(
+                    type_="create_area",
                     payload={"name": self.onbekend_area_name},
                     reason="Fallback area requested to ensure everything has an effective area.",
                     confidence=0.6,
@@ -552,29 +950,12 @@ class HousekeeperEngine:
 
         # Entities still without effective area: optionally place into Onbekend (approval).
         if include_onbekend_fallback:
-            onbekend_area_id = None
-            for a in areas:
-                if a.get("name") == self.onbekend_area_name:
-                    onbekend_area_id = a.get("area_id")
-                    break
+            onbekend_area_id = area_id_by_name.get(self.onbekend_area_name)
             if onbekend_area_id:
-                for er in entities:
-                    entity_id = er.get("entity_id")
-                    if not entity_id:
-                        continue
-                    if entity_id in planned_entity_area:
-                        continue
-                    if entity_id in planned_entity_remove:
-                        continue
-                    st = states_by_entity_id.get(entity_id)
-                    if not _is_active_state(st):
-                        continue
-                    if _effective_area_id(er, device_by_id):
-                        continue
+                for entity_id in fallback_candidates:
                     actions.append(
-                        Action(
-                            id=str(uuid.uuid4()),
-                            type="set_entity_area",
+                        _mk(
+                            type_="set_entity_area",
                             payload={"entity_id": entity_id, "area_id": onbekend_area_id},
                             reason=f"Fallback: put entity into area '{self.onbekend_area_name}'.",
                             confidence=0.6,
@@ -584,19 +965,12 @@ class HousekeeperEngine:
                     planned_entity_area.add(entity_id)
 
         # Suffix duplicate entities: propose removal (approval required).
-        for er in entities:
-            entity_id = er.get("entity_id")
-            if not entity_id:
-                continue
+        for entity_id, base in ix.suffix_dupes:
             if entity_id in planned_entity_remove:
                 continue
-            is_dup, base = is_suffix_duplicate_entity(entity_id)
-            if not is_dup or base not in entity_ids:
-                continue
             actions.append(
-                Action(
-                    id=str(uuid.uuid4()),
-                    type="remove_entity_registry_entry",
+                _mk(
+                    type_="remove_entity_registry_entry",
                     payload={"entity_id": entity_id},
                     reason=f"Entity id looks like a suffix duplicate of '{base}'.",
                     confidence=0.9,
@@ -606,25 +980,19 @@ class HousekeeperEngine:
             planned_entity_remove.add(entity_id)
 
         # Unique_id duplicates: suggest hiding all but the first one (approval).
-        by_unique_id: dict[str, list[str]] = {}
-        for er in entities:
-            uid = er.get("unique_id")
-            eid = er.get("entity_id")
-            if uid and eid:
-                by_unique_id.setdefault(uid, []).append(eid)
-        for uid, eids in by_unique_id.items():
+        for uid, eids in ix.by_unique_id.items():
             if len(eids) <= 1:
                 continue
             kept = sorted(eids)[0]
             for eid in sorted(eids)[1:]:
                 if eid in planned_entity_hide or eid in planned_entity_remove:
                     continue
-                if _is_hidden_or_disabled(entity_reg_by_id.get(eid, {})):
+                row = row_by_id.get(eid)
+                if row is not None and row.hidden:
                     continue
                 actions.append(
-                    Action(
-                        id=str(uuid.uuid4()),
-                        type="hide_entity",
+                    _mk(
+                        type_="hide_entity",
                         payload={"entity_id": eid, "hidden_by": "user"},
                         reason=f"Duplicate unique_id '{uid}'. Keeping '{kept}', hiding '{eid}'.",
                         confidence=0.9,
@@ -633,44 +1001,28 @@ class HousekeeperEngine:
                 )
                 planned_entity_hide.add(eid)
 
-        area_id_by_name_lower = {
-            str(a.get("name")).strip().lower(): a.get("area_id")
-            for a in areas
-            if a.get("name") and a.get("area_id")
-        }
-
         # Entity area assignment rules (regex -> area).
-        for rr in rules.get("entity_area", []) or []:
-            if not isinstance(rr, dict):
-                continue
-            pat = str(rr.get("pattern") or "")
-            area_name = str(rr.get("area") or "").strip()
-            if not pat or not area_name:
-                continue
-            rx = self._compile_regex(pat)
-            if not rx:
-                continue
-            req = bool(rr.get("requires_approval", True))
-            overwrite = bool(rr.get("overwrite", False))
-            target_area_id = area_id_by_name_lower.get(area_name.lower())
-            if not target_area_id:
-                continue
-            for er in entities:
-                entity_id = er.get("entity_id") or ""
-                if not entity_id or entity_id in planned_entity_remove:
+        entity_area_rules = self._prepare_regex_rules(
+            rules.get("entity_area"), area_id_by_name_lower
+        )
+        union = self._union_regex([r.rx for r in entity_area_rules])
+        area_candidates = [
+            (entity_id, row)
+            for entity_id, (row, _st) in active.items()
+            if not union or union.search(entity_id)
+        ]
+        for rule in entity_area_rules:
+            rx, pat, req, overwrite = rule.rx, rule.pattern, rule.requires_approval, rule.overwrite
+            area_name, target_area_id = rule.area_name, rule.area_id
+            for entity_id, row in area_candidates:
+                if entity_id in planned_entity_remove:
                     continue
-                st = states_by_entity_id.get(entity_id)
-                if not _is_active_state(st):
-                    continue
-                if not overwrite and (
-                    _effective_area_id(er, device_by_id) or entity_id in planned_entity_area
-                ):
+                if not overwrite and (row.effective_area_id or entity_id in planned_entity_area):
                     continue
                 if rx.search(entity_id):
                     actions.append(
-                        Action(
-                            id=str(uuid.uuid4()),
-                            type="set_entity_area",
+                        _mk(
+                            type_="set_entity_area",
                             payload={"entity_id": entity_id, "area_id": target_area_id},
                             reason=f"Rule: entity_id matches /{pat}/ -> area '{area_name}'.",
                             confidence=0.9,
@@ -680,21 +1032,9 @@ class HousekeeperEngine:
                     planned_entity_area.add(entity_id)
 
         # Device area assignment rules (device name regex -> area).
-        for rr in rules.get("device_area", []) or []:
-            if not isinstance(rr, dict):
-                continue
-            pat = str(rr.get("pattern") or "")
-            area_name = str(rr.get("area") or "").strip()
-            if not pat or not area_name:
-                continue
-            rx = self._compile_regex(pat)
-            if not rx:
-                continue
-            req = bool(rr.get("requires_approval", True))
-            overwrite = bool(rr.get("overwrite", False))
-            target_area_id = area_id_by_name_lower.get(area_name.lower())
-            if not target_area_id:
-                continue
+        for rule in self._prepare_regex_rules(rules.get("device_area"), area_id_by_name_lower):
+            rx, pat, req, overwrite = rule.rx, rule.pattern, rule.requires_approval, rule.overwrite
+            area_name, target_area_id = rule.area_name, rule.area_id
             for dv in devices:
                 device_id = dv.get("id")
                 if not device_id:
@@ -706,9 +1046,8 @@ class HousekeeperEngine:
                     continue
                 if rx.search(name):
                     actions.append(
-                        Action(
-                            id=str(uuid.uuid4()),
-                            type="set_device_area",
+                        _mk(
+                            type_="set_device_area",
                             payload={"device_id": device_id, "area_id": target_area_id},
                             reason=f"Rule: device name matches /{pat}/ -> area '{area_name}'.",
                             confidence=0.9,
@@ -717,70 +1056,62 @@ class HousekeeperEngine:
                     )
 
         # Helpers: suggest strong areas based on keywords (approval).
-        helper_area_rules = rules.get("helper_area_rules", []) or []
-        for er in entities:
-            entity_id = er.get("entity_id") or ""
-            st = states_by_entity_id.get(entity_id)
-            if not _is_active_state(st):
+        # Validate rules and resolve their target areas once, outside the entity loop.
+        prepared_helpers: list[tuple[frozenset[str], str, bool, str]] = []
+        for hr in rules.get("helper_area_rules", []) or []:
+            if not isinstance(hr, dict):
+                continue
+            area_name = str(hr.get("area") or "").strip()
+            kws_raw = hr.get("keywords") or []
+            kws = frozenset(
+                str(x).strip().lower() for x in kws_raw if isinstance(x, str) and str(x).strip()
+            )
+            if not area_name or not kws:
                 continue
-            if not entity_id:
+            # Only if target area exists.
+            # (We can add create-area later, but keep safety.)
+            target_area_id = area_id_by_name_lower.get(area_name.lower())
+            if not target_area_id:
                 continue
+            req = bool(hr.get("requires_approval", True))
+            prepared_helpers.append((kws, target_area_id, req, area_name))
+        # keyword -> indices of the rules listing it, so each entity probes its own tokens
+        # instead of intersecting its token set with every rule's keywords.
+        helper_rules_by_kw: dict[str, list[int]] = {}
+        for idx, (kws, _, _, _) in enumerate(prepared_helpers):
+            for kw in kws:
+                helper_rules_by_kw.setdefault(kw, []).append(idx)
+        for entity_id, (row, _st) in active.items():
             if entity_id in planned_entity_area:
                 continue
-            if _effective_area_id(er, device_by_id):
+            if row.effective_area_id:
                 continue
-            tokens = tokenize(
-                entity_id
-                + " "
-                + str(er.get("original_name") or "")
-                + " "
-                + str(er.get("name") or "")
-            )
-            for hr in helper_area_rules:
-                if not isinstance(hr, dict):
-                    continue
-                area_name = str(hr.get("area") or "").strip()
-                kws_raw = hr.get("keywords") or []
-                kws = {
-                    str(x).strip().lower() for x in kws_raw if isinstance(x, str) and str(x).strip()
-                }
-                if not area_name or not kws:
-                    continue
-                req = bool(hr.get("requires_approval", True))
-                if not (kws & tokens):
-                    continue
-                # Only if target area exists.
-                # (We can add create-area later, but keep safety.)
-                target_area_id = area_id_by_name_lower.get(area_name.strip().lower())
-                if not target_area_id:
-                    continue
-                actions.append(
-                    Action(
-                        id=str(uuid.uuid4()),
-                        type="set_entity_area",
-                        payload={"entity_id": entity_id, "area_id": target_area_id},
-                        reason=f"Rule: keyword match suggests area '{area_name}'.",
-                        confidence=0.85,
-                        requires_approval=req,
-                    )
+            tokens = _entity_tok(entity_id, row)
+            hits = [idx for tok in tokens for idx in helper_rules_by_kw.get(tok, ())]
+            if not hits:
+                continue
+            # Rules apply in file order; the first matching one wins.
+            _, target_area_id, req, area_name = prepared_helpers[min(hits)]
+            actions.append(
+                _mk(
+                    type_="set_entity_area",
+                    payload={"entity_id": entity_id, "area_id": target_area_id},
+                    reason=f"Rule: keyword match suggests area '{area_name}'.",
+                    confidence=0.85,
+                    requires_approval=req,
                 )
-                break
+            )
 
         # Media players: propose renames for generic/empty names based on effective area (approval).
         media_candidates = []
-        for er in entities:
-            entity_id = er.get("entity_id")
-            if not entity_id or not entity_id.startswith("media_player."):
-                continue
-            st = states_by_entity_id.get(entity_id)
-            if not _is_active_state(st):
-                continue
-            eff_area_id = _effective_area_id(er, device_by_id)
+        for entity_id in ix.active_by_domain["media_player"]:
+            row, st = active[entity_id]
+            eff_area_id = row.effective_area_id
             if not eff_area_id:
                 continue
             current = (
-                er.get("name")
-                or er.get("original_name")
+                row.name
+                or row.original_name
                 or str((st.get("attributes") or {}).get("friendly_name") or "")
             )
             if not _looks_generic_media_name(current):
@@ -789,33 +1120,48 @@ class HousekeeperEngine:
             media_candidates.append((eff_area_id, base, entity_id, current))
 
         # Stable numbering per (area, base).
-        grouped: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        grouped: defaultdict[tuple[str, str], list[tuple[str, str]]] = defaultdict(list)
         for area_id, base, entity_id, current in media_candidates:
-            grouped.setdefault((area_id, base), []).append((entity_id, current))
+            grouped[(area_id, base)].append((entity_id, current))
 
+        # Bound-method lookups hoisted out of the per-group loop.
+        area_name_of = area_name_by_id.get
+        extend_actions = actions.extend
         for (area_id, base), items in grouped.items():
-            items_sorted = sorted(items, key=lambda x: x[0])
-            area_name = area_name_by_id.get(area_id) or area_id
-            need_numbers = len(items_sorted) > 1
-            for idx, (entity_id, current) in enumerate(items_sorted, start=1):
-                new_name = f"{base} {area_name}" + (f" {idx}" if need_numbers else "")
-                actions.append(
-                    Action(
-                        id=str(uuid.uuid4()),
-                        type="rename_entity",
-                        payload={"entity_id": entity_id, "name": new_name},
-                        reason=f"Generic media player name '{current}' -> '{new_name}' based on effective area.",
-                        confidence=0.8,
-                        requires_approval=True,
-                    )
+            # Entity ids are unique, so plain tuple order is entity_id order; no key function.
+            items.sort()
+            area_name = area_name_of(area_id) or area_id
+            prefix = f"{base} {area_name}"
+            if len(items) > 1:
+                new_names = [f"{prefix} {idx}" for idx in range(1, len(items) + 1)]
+            else:
+                new_names = [prefix]
+            extend_actions(
+                _mk(
+                    type_="rename_entity",
+                    payload={"entity_id": entity_id, "name": new_name},
+                    reason=f"Generic media player name '{current}' -> '{new_name}' based on effective area.",
+                    confidence=0.8,
+                    requires_approval=True,
                 )
-
-        all_actions = [asdict_action(a) for a in actions]
+                for (entity_id, current), new_name in zip(items, new_names, strict=True)
+            )
 
         # Filter out ignored actions
-        ignored = set(self.load_ignored())
-        visible_actions = [a for a in all_actions if self.action_fingerprint(a) not in ignored]
-        ignored_count = len(all_actions) - len(visible_actions)
+        ignored = self.load_ignored()
+        if ignored:
+            visible_actions = [a for a, fp in actions if fp not in ignored]
+            ignored_count = len(actions) - len(visible_actions)
+        else:
+            # Nothing ignored (the usual case): skip the per-action membership test.
+            visible_actions = [a for a, _ in actions]
+            ignored_count = 0
+
+        # Identifies the registry snapshot this plan was built from (see apply()).
+        snapshot_digest = hashlib.blake2b(
+            "\n".join(sorted_entity_ids).encode(), digest_size=8
+        ).hexdigest()
+        self._last_snapshot = (ix.registry, snapshot_digest)
 
         plan = {
             "created_at": _now_iso(),
@@ -823,60 +1169,76 @@ class HousekeeperEngine:
             "actions": visible_actions,
             "area_name_by_id": area_name_by_id,
             "ignored_count": ignored_count,
+            "snapshot_digest": snapshot_digest,
         }
         self.save_plan(plan)
         return {"plan": plan}
 
     def save_plan(self, plan: dict[str, Any]) -> None:
-        with open(self.plan_path, "w", encoding="utf-8") as f:
-            json.dump(plan, f, indent=2, sort_keys=True)
+        _write_json(self.plan_path, plan)
 
     def load_plan(self) -> dict[str, Any] | None:
         if not os.path.exists(self.plan_path):
             return None
-        with open(self.plan_path, encoding="utf-8") as f:
-            return json.load(f)
+        return _read_json(self.plan_path)
 
     def save_rollback(self, rb: dict[str, Any]) -> None:
-        with open(self.rollback_path, "w", encoding="utf-8") as f:
-            json.dump(rb, f, indent=2, sort_keys=True)
+        _write_json(self.rollback_path, rb)
 
     def load_rollback(self) -> dict[str, Any] | None:
         if not os.path.exists(self.rollback_path):
             return None
-        with open(self.rollback_path, encoding="utf-8") as f:
-            return json.load(f)
+        return _read_json(self.rollback_path)
 
     @staticmethod
     def action_fingerprint(action: dict[str, Any]) -> str:
-        atype = action.get("type", "")
-        p = action.get("payload") or {}
-        key = p.get("entity_id") or p.get("device_id") or p.get("area_id") or p.get("name") or ""
-        return f"{atype}:{key}"
-
-    def load_ignored(self) -> list[str]:
-        if not os.path.exists(self.ignored_path):
-            return []
+        return _fingerprint(action.get("type", ""), action.get("payload") or {})
+
+    def load_ignored(self) -> frozenset[str]:
+        try:
+            st = os.stat(self.ignored_path)
+        except FileNotFoundError:
+            return frozenset()
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._ignored_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        # Universal newlines: the file may be hand-edited with CRLF line endings. Only the line
+        # terminator is removed, so every line reads back exactly as written.
         with open(self.ignored_path, encoding="utf-8") as f:
-            return json.load(f)
+            ignored = frozenset(line for line in f.read().split("\n") if line)
+        self._ignored_cache = (key, ignored)
+        return ignored
 
-    def save_ignored(self, fingerprints: list[str]) -> None:
-        with open(self.ignored_path, "w", encoding="utf-8") as f:
-            json.dump(sorted(set(fingerprints)), f, indent=2)
+    def save_ignored(self, fingerprints: Iterable[str]) -> None:
+        lines = sorted({fp for fp in fingerprints if _storable_fingerprint(fp)})
+        with open(self.ignored_path, "w", encoding="utf-8", newline="") as f:
+            f.write("".join(f"{fp}\n" for fp in lines))
+        self._ignored_cache = None
 
     def add_ignored(self, fingerprints: list[str]) -> list[str]:
-        current = set(self.load_ignored())
-        current.update(fingerprints)
-        result = sorted(current)
-        self.save_ignored(result)
-        return result
+        current = self.load_ignored()
+        new = {fp for fp in fingerprints if _storable_fingerprint(fp)}.difference(current)
+        if not new:
+            return sorted(current)
+        # Append only the new lines; the existing file is never rewritten here. A hand-edited
+        # file may lack the final newline, so start on a fresh line first.
+        text = "".join(f"{fp}\n" for fp in sorted(new))
+        with open(self.ignored_path, "a+b") as f:
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    text = "\n" + text
+            f.write(text.encode())
+        # Re-read rather than trusting the in-memory union, so the cache matches the file.
+        return sorted(self.load_ignored())
 
     def remove_ignored(self, fingerprints: list[str]) -> list[str]:
-        current = set(self.load_ignored())
-        current -= set(fingerprints)
-        result = sorted(current)
-        self.save_ignored(result)
-        return result
+        current = self.load_ignored()
+        updated = current.difference(fp for fp in fingerprints if _storable_fingerprint(fp))
+        if updated != current:
+            self.save_ignored(updated)
+        return sorted(updated)
 
     def clear_ignored(self) -> None:
         self.save_ignored([])
@@ -886,227 +1248,259 @@ class HousekeeperEngine:
         if not plan:
             raise ValueError("No plan.json found; run /plan first")
 
+        # Snapshot registries for rollback, then drop the cached snapshots: the registry is
+        # about to change. The snapshot this plan was built from is reused while it's recent.
+        last = self._last_snapshot
+        if (
+            last is not None
+            and last[1] == plan.get("snapshot_digest")
+            and time.monotonic() - last[0].fetched_at < _SNAPSHOT_MAX_AGE_S
+        ):
+            registry = last[0]
+        else:
+            registry = await self._registry()
+        self._invalidate_snapshots()
+
         approved = set(approved_action_ids or [])
         actions = plan.get("actions") or []
 
-        rollback_steps: list[dict[str, Any]] = []
-        applied: list[str] = []
-        skipped: list[dict[str, Any]] = []
-
-        # Snapshot registries for rollback.
-        entities = await self.ha.entity_list()
-        areas = await self.ha.area_list()
-        devices = await self.ha.device_list()
-        entity_by_id = {e.get("entity_id"): e for e in entities if e.get("entity_id")}
-        area_by_name = {a.get("name"): a for a in areas if a.get("name")}
-        device_by_id = {d.get("id"): d for d in devices if d.get("id")}
-        area_by_id = {a.get("area_id"): a for a in areas if a.get("area_id")}
-
+        run = _ApplyRun(registry=registry)
+        handlers = self._apply_handlers
         for a in actions:
             aid = a.get("id")
             if bool(a.get("requires_approval")) and aid not in approved:
-                skipped.append({"id": aid, "reason": "requires_approval"})
+                run.skipped.append({"id": aid, "reason": "requires_approval"})
                 continue
 
             atype = a.get("type")
-            payload = a.get("payload") or {}
-
-            if atype == "create_area":
-                name = payload.get("name")
-                if not name:
-                    skipped.append({"id": aid, "reason": "missing name"})
-                    continue
-                if name in area_by_name:
-                    applied.append(aid)
-                    continue
-                res = await self.ha.area_create(name=name)
-                area_id = res.get("area_id")
-                rollback_steps.append(
-                    {
-                        "type": "note",
-                        "note": "Area created; rollback does not delete areas.",
-                        "area_id": area_id,
-                        "name": name,
-                    }
-                )
-                applied.append(aid)
+            handler = handlers.get(atype) if isinstance(atype, str) else None
+            if handler is None:
+                run.skipped.append({"id": aid, "reason": f"unsupported action type {atype}"})
                 continue
+            await handler(run, aid, a.get("payload") or {})
 
-            if atype == "set_entity_area":
-                entity_id = payload.get("entity_id")
-                area_id = payload.get("area_id")
-                if not entity_id or not area_id:
-                    skipped.append({"id": aid, "reason": "missing entity_id/area_id"})
-                    continue
-                before = entity_by_id.get(entity_id, {})
-                rollback_steps.append(
-                    {
-                        "type": "entity_update",
-                        "entity_id": entity_id,
-                        "before": {"area_id": before.get("area_id")},
-                    }
-                )
-                await self.ha.entity_update(entity_id=entity_id, area_id=area_id)
-                applied.append(aid)
-                continue
+        await run.flush()
 
-            if atype == "set_device_area":
-                device_id = payload.get("device_id")
-                area_id = payload.get("area_id")
-                if not device_id or not area_id:
-                    skipped.append({"id": aid, "reason": "missing device_id/area_id"})
-                    continue
-                before = device_by_id.get(device_id, {})
-                rollback_steps.append(
-                    {
-                        "type": "device_update",
-                        "device_id": device_id,
-                        "before": {"area_id": before.get("area_id")},
-                    }
-                )
-                await self.ha.device_update(device_id=device_id, area_id=area_id)
-                applied.append(aid)
-                continue
-
-            if atype == "rename_entity":
-                entity_id = payload.get("entity_id")
-                name = payload.get("name")
-                if not entity_id or not name:
-                    skipped.append({"id": aid, "reason": "missing entity_id/name"})
-                    continue
-                before = entity_by_id.get(entity_id, {})
-                rollback_steps.append(
-                    {
-                        "type": "entity_update",
-                        "entity_id": entity_id,
-                        "before": {"name": before.get("name")},
-                    }
-                )
-                await self.ha.entity_update(entity_id=entity_id, name=name)
-                applied.append(aid)
-                continue
-
-            if atype == "hide_entity":
-                entity_id = payload.get("entity_id")
-                hidden_by = payload.get("hidden_by", "user")
-                if not entity_id:
-                    skipped.append({"id": aid, "reason": "missing entity_id"})
-                    continue
-                before = entity_by_id.get(entity_id, {})
-                rollback_steps.append(
-                    {
-                        "type": "entity_update",
-                        "entity_id": entity_id,
-                        # Roll back both fields if present; HA ignores unknown keys.
-                        "before": {
-                            "hidden_by": before.get("hidden_by"),
-                            "disabled_by": before.get("disabled_by"),
-                        },
-                    }
-                )
-                # HA has changed "hide" semantics over time.
-                # Prefer hidden_by, but verify it actually applied; otherwise fall back to disabled_by.
-                hidden_applied = False
-                disabled_applied = False
-                try:
-                    await self.ha.entity_update(entity_id=entity_id, hidden_by=hidden_by)
-                    try:
-                        after_entities = await self.ha.entity_list()
-                        after = next(
-                            (e for e in after_entities if e.get("entity_id") == entity_id), None
-                        )
-                        hidden_applied = bool(after and after.get("hidden_by") == hidden_by)
-                    except Exception:
-                        # If we can't verify, assume hidden_by worked (don't unexpectedly disable).
-                        hidden_applied = True
-                except Exception:
-                    hidden_applied = False
-
-                if not hidden_applied:
-                    await self.ha.entity_update(entity_id=entity_id, disabled_by="user")
-                    try:
-                        after_entities = await self.ha.entity_list()
-                        after = next(
-                            (e for e in after_entities if e.get("entity_id") == entity_id), None
-                        )
-                        disabled_applied = bool(after and after.get("disabled_by") == "user")
-                    except Exception:
-                        disabled_applied = True
-
-                if not hidden_applied and not disabled_applied:
-                    skipped.append({"id": aid, "reason": "hide not applied by Home Assistant"})
-                    logger.warning("Hide entity did not apply: %s", entity_id)
-                    continue
-
-                logger.info(
-                    "Hide entity applied: entity_id=%s hidden_by=%s disabled_by=%s",
-                    entity_id,
-                    "user" if hidden_applied else "",
-                    "user" if (not hidden_applied and disabled_applied) else "",
-                )
-                applied.append(aid)
-                continue
-
-            if atype == "remove_entity_registry_entry":
-                entity_id = payload.get("entity_id")
-                if not entity_id:
-                    skipped.append({"id": aid, "reason": "missing entity_id"})
-                    continue
-                before = entity_by_id.get(entity_id)
-                rollback_steps.append(
-                    {"type": "entity_restore_note", "entity_id": entity_id, "before": before}
-                )
-                await self.ha.entity_remove(entity_id=entity_id)
-                applied.append(aid)
-                continue
-
-            if atype == "rename_device":
-                device_id = payload.get("device_id")
-                name = payload.get("name")
-                if not device_id or not name:
-                    skipped.append({"id": aid, "reason": "missing device_id/name"})
-                    continue
-                before = device_by_id.get(device_id, {})
-                rollback_steps.append(
-                    {
-                        "type": "device_update",
-                        "device_id": device_id,
-                        "before": {"name_by_user": before.get("name_by_user")},
-                    }
-                )
-                await self.ha.device_update(device_id=device_id, name_by_user=name)
-                applied.append(aid)
-                continue
-
-            if atype == "rename_area":
-                area_id = payload.get("area_id")
-                name = payload.get("name")
-                if not area_id or not name:
-                    skipped.append({"id": aid, "reason": "missing area_id/name"})
-                    continue
-                before = area_by_id.get(area_id, {})
-                rollback_steps.append(
-                    {
-                        "type": "area_update",
-                        "area_id": area_id,
-                        "before": {"name": before.get("name")},
-                    }
-                )
-                await self.ha.area_update(area_id=area_id, name=name)
-                applied.append(aid)
-                continue
-
-            skipped.append({"id": aid, "reason": f"unsupported action type {atype}"})
-
-        rb = {"created_at": _now_iso(), "steps": rollback_steps}
+        # Reads made while the loop was writing may have cached a half-applied registry.
+        self._invalidate_snapshots()
+        rb = {"created_at": _now_iso(), "steps": run.rollback_steps}
         self.save_rollback(rb)
-        return {"applied_action_ids": applied, "skipped": skipped, "rollback": rb}
+        return {"applied_action_ids": run.applied, "skipped": run.skipped, "rollback": rb}
+
+    async def _apply_create_area(self, run: _ApplyRun, aid: str, payload: dict[str, Any]) -> None:
+        await run.flush()
+        name = payload.get("name")
+        if not name:
+            run.skipped.append({"id": aid, "reason": "missing name"})
+            return
+        if name in run.registry.area_by_name:
+            run.applied.append(aid)
+            return
+        try:
+            res = await self.ha.area_create(name=name)
+        except Exception as e:
+            logger.warning("Action %s failed: %s", aid, e)
+            run.skipped.append({"id": aid, "reason": f"failed: {e}"})
+            return
+        area_id = res.get("area_id")
+        run.rollback_steps.append(
+            {
+                "type": "note",
+                "note": "Area created; rollback does not delete areas.",
+                "area_id": area_id,
+                "name": name,
+            }
+        )
+        run.applied.append(aid)
+
+    async def _apply_set_entity_area(
+        self, run: _ApplyRun, aid: str, payload: dict[str, Any]
+    ) -> None:
+        entity_id = payload.get("entity_id")
+        area_id = payload.get("area_id")
+        if not entity_id or not area_id:
+            run.skipped.append({"id": aid, "reason": "missing entity_id/area_id"})
+            return
+        before = run.registry.entity_by_id.get(entity_id, {})
+        run.rollback_steps.append(
+            {
+                "type": "entity_update",
+                "entity_id": entity_id,
+                "before": {"area_id": before.get("area_id")},
+            }
+        )
+        await run.queue(
+            aid,
+            f"entity:{entity_id}",
+            functools.partial(self.ha.entity_update, entity_id=entity_id, area_id=area_id),
+        )
+
+    async def _apply_set_device_area(
+        self, run: _ApplyRun, aid: str, payload: dict[str, Any]
+    ) -> None:
+        device_id = payload.get("device_id")
+        area_id = payload.get("area_id")
+        if not device_id or not area_id:
+            run.skipped.append({"id": aid, "reason": "missing device_id/area_id"})
+            return
+        before = run.registry.device_by_id.get(device_id, {})
+        run.rollback_steps.append(
+            {
+                "type": "device_update",
+                "device_id": device_id,
+                "before": {"area_id": before.get("area_id")},
+            }
+        )
+        await run.queue(
+            aid,
+            f"device:{device_id}",
+            functools.partial(self.ha.device_update, device_id=device_id, area_id=area_id),
+        )
+
+    async def _apply_rename_entity(self, run: _ApplyRun, aid: str, payload: dict[str, Any]) -> None:
+        entity_id = payload.get("entity_id")
+        name = payload.get("name")
+        if not entity_id or not name:
+            run.skipped.append({"id": aid, "reason": "missing entity_id/name"})
+            return
+        before = run.registry.entity_by_id.get(entity_id, {})
+        run.rollback_steps.append(
+            {
+                "type": "entity_update",
+                "entity_id": entity_id,
+                "before": {"name": before.get("name")},
+            }
+        )
+        await run.queue(
+            aid,
+            f"entity:{entity_id}",
+            functools.partial(self.ha.entity_update, entity_id=entity_id, name=name),
+        )
+
+    async def _apply_hide_entity(self, run: _ApplyRun, aid: str, payload: dict[str, Any]) -> None:
+        # Verified step by step below, so it runs on its own.
+        await run.flush()
+        entity_id = payload.get("entity_id")
+        hidden_by = payload.get("hidden_by", "user")
+        if not entity_id:
+            run.skipped.append({"id": aid, "reason": "missing entity_id"})
+            return
+        before = run.registry.entity_by_id.get(entity_id, {})
+        run.rollback_steps.append(
+            {
+                "type": "entity_update",
+                "entity_id": entity_id,
+                # Roll back both fields if present; HA ignores unknown keys.
+                "before": {
+                    "hidden_by": before.get("hidden_by"),
+                    "disabled_by": before.get("disabled_by"),
+                },
+            }
+        )
+        # HA has changed "hide" semantics over time.
+        # Prefer hidden_by, but verify it actually applied; otherwise fall back to disabled_by.
+        hidden_applied = False
+        disabled_applied = False
+        try:
+            await self.ha.entity_update(entity_id=entity_id, hidden_by=hidden_by)
+            try:
+                after_entities = await self.ha.entity_list()
+                after = next((e for e in after_entities if e.get("entity_id") == entity_id), None)
+                hidden_applied = bool(after and after.get("hidden_by") == hidden_by)
+            except Exception:
+                # If we can't verify, assume hidden_by worked (don't unexpectedly disable).
+                hidden_applied = True
+        except Exception:
+            hidden_applied = False
+
+        if not hidden_applied:
+            try:
+                await self.ha.entity_update(entity_id=entity_id, disabled_by="user")
+            except Exception as e:
+                logger.warning("Action %s failed: %s", aid, e)
+                run.skipped.append({"id": aid, "reason": f"failed: {e}"})
+                return
+            try:
+                after_entities = await self.ha.entity_list()
+                after = next((e for e in after_entities if e.get("entity_id") == entity_id), None)
+                disabled_applied = bool(after and after.get("disabled_by") == "user")
+            except Exception:
+                disabled_applied = True
+
+        if not hidden_applied and not disabled_applied:
+            run.skipped.append({"id": aid, "reason": "hide not applied by Home Assistant"})
+            logger.warning("Hide entity did not apply: %s", entity_id)
+            return
+
+        logger.info(
+            "Hide entity applied: entity_id=%s hidden_by=%s disabled_by=%s",
+            entity_id,
+            "user" if hidden_applied else "",
+            "user" if (not hidden_applied and disabled_applied) else "",
+        )
+        run.applied.append(aid)
+
+    async def _apply_remove_entity(self, run: _ApplyRun, aid: str, payload: dict[str, Any]) -> None:
+        entity_id = payload.get("entity_id")
+        if not entity_id:
+            run.skipped.append({"id": aid, "reason": "missing entity_id"})
+            return
+        before = run.registry.entity_by_id.get(entity_id)
+        run.rollback_steps.append(
+            {"type": "entity_restore_note", "entity_id": entity_id, "before": before}
+        )
+        await run.queue(
+            aid,
+            f"entity:{entity_id}",
+            functools.partial(self.ha.entity_remove, entity_id=entity_id),
+        )
+
+    async def _apply_rename_device(self, run: _ApplyRun, aid: str, payload: dict[str, Any]) -> None:
+        device_id = payload.get("device_id")
+        name = payload.get("name")
+        if not device_id or not name:
+            run.skipped.append({"id": aid, "reason": "missing device_id/name"})
+            return
+        before = run.registry.device_by_id.get(device_id, {})
+        run.rollback_steps.append(
+            {
+                "type": "device_update",
+                "device_id": device_id,
+                "before": {"name_by_user": before.get("name_by_user")},
+            }
+        )
+        await run.queue(
+            aid,
+            f"device:{device_id}",
+            functools.partial(self.ha.device_update, device_id=device_id, name_by_user=name),
+        )
+
+    async def _apply_rename_area(self, run: _ApplyRun, aid: str, payload: dict[str, Any]) -> None:
+        area_id = payload.get("area_id")
+        name = payload.get("name")
+        if not area_id or not name:
+            run.skipped.append({"id": aid, "reason": "missing area_id/name"})
+            return
+        before = run.registry.area_by_id.get(area_id, {})
+        run.rollback_steps.append(
+            {
+                "type": "area_update",
+                "area_id": area_id,
+                "before": {"name": before.get("name")},
+            }
+        )
+        await run.queue(
+            aid,
+            f"area:{area_id}",
+            functools.partial(self.ha.area_update, area_id=area_id, name=name),
+        )
 
     async def rollback(self) -> dict[str, Any]:
         rb = self.load_rollback()
         if not rb:
             return {"ok": False, "detail": "No rollback.json found"}
 
+        self._invalidate_snapshots()
         steps = rb.get("steps") or []
         reverted = 0
         errors: list[dict[str, Any]] = []
@@ -1140,4 +1534,5 @@ class HousekeeperEngine:
             except Exception as e:
                 errors.append({"step": st, "error": str(e)})
 
+        self._invalidate_snapshots()
         return {"ok": len(errors) == 0, "reverted": reverted, "errors": errors}
@@ -2,17 +2,28 @@
 
 import asyncio
 import contextlib
-import json
 import logging
 from typing import Any
 
 import websockets
 
+try:
+    from orjson import dumps as _orjson_dumps
+    from orjson import loads as _loads
+
+    def _dumps(obj: Any) -> str:
+        # HA expects text frames, so hand websockets a str rather than bytes.
+        return _orjson_dumps(obj).decode()
+
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    from json import dumps as _dumps
+    from json import loads as _loads
+
 logger = logging.getLogger(__name__)
 
 
 class HAWebSocketClient:
-    """Simple synchronous request-response WS client for HA."""
+    """Request-response WS client for HA; a background reader matches results to requests."""
 
     def __init__(self, url: str, token: str, timeout: float = 30.0):
         self.url = url
@@ -20,13 +31,23 @@ class HAWebSocketClient:
         self.timeout = timeout
         self._ws: Any | None = None
         self._msg_id = 1
+        self._pending: dict[int, asyncio.Future] = {}
+        self._reader_task: asyncio.Task | None = None
+        self._connect_lock = asyncio.Lock()
 
     async def connect(self) -> None:
         """Connect and authenticate to HA WebSocket."""
-        if self._ws is not None:
-            with contextlib.suppress(Exception):
-                await self._ws.close()
-            self._ws = None
+        async with self._connect_lock:
+            await self._connect()
+
+    async def _ensure_connected(self) -> None:
+        # Concurrent senders must not each open (and then tear down) their own connection.
+        async with self._connect_lock:
+            if self._ws is None:
+                await self._connect()
+
+    async def _connect(self) -> None:
+        await self._close_ws()
 
         if not self.token:
             raise ConnectionError(
@@ -44,13 +65,13 @@ class HAWebSocketClient:
 
             # auth_required
             raw = await asyncio.wait_for(self._ws.recv(), timeout=10.0)
-            msg = json.loads(raw)
+            msg = _loads(raw)
             if msg.get("type") != "auth_required":
                 raise ConnectionError(f"Expected auth_required, got: {msg.get('type')}")
 
             # Send auth
             await self._ws.send(
-                json.dumps(
+                _dumps(
                     {
                         "type": "auth",
                         "access_token": self.token,
@@ -60,10 +81,11 @@ class HAWebSocketClient:
 
             # auth response
             raw = await asyncio.wait_for(self._ws.recv(), timeout=10.0)
-            resp = json.loads(raw)
+            resp = _loads(raw)
             if resp.get("type") != "auth_ok":
                 raise ConnectionError(f"Auth failed: {resp.get('message', 'unknown')}")
 
+            self._reader_task = asyncio.create_task(self._reader(self._ws))
             logger.info("Connected to Home Assistant successfully")
 
         except TimeoutError:
@@ -77,43 +99,85 @@ class HAWebSocketClient:
             raise ConnectionError(f"Failed to connect: {e}") from e
 
     async def _close_ws(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
         if self._ws:
             with contextlib.suppress(Exception):
                 await self._ws.close()
             self._ws = None
+        self._fail_pending(ConnectionError("Connection to Home Assistant closed"))
+
+    def _fail_pending(self, exc: Exception) -> None:
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def _reader(self, ws: Any) -> None:
+        """Route result messages to the waiting send() calls; skip events and other messages."""
+        error: Exception = ConnectionError("Connection to Home Assistant closed")
+        try:
+            async for raw in ws:
+                try:
+                    data = _loads(raw)
+                except ValueError:
+                    logger.warning("Ignoring undecodable WS frame")
+                    continue
+                if not isinstance(data, dict) or data.get("type") != "result":
+                    continue
+                fut = self._pending.pop(data.get("id"), None)
+                if fut is not None and not fut.done():
+                    fut.set_result(data)
+        except Exception as e:
+            error = e
+        # Make sure the socket is really closed so the reconnect doesn't leave it orphaned.
+        with contextlib.suppress(Exception):
+            await ws.close()
+        # The connection is gone; let the next send() reconnect.
+        if self._ws is ws:
+            self._ws = None
+            self._reader_task = None
+        self._fail_pending(error)
 
     async def send(self, msg_type: str, **kwargs: Any) -> Any:
-        """Send command and read response directly (no background reader)."""
+        """Send command and wait for its result; several sends may be in flight at once."""
         if self._ws is None:
-            await self.connect()
+            await self._ensure_connected()
+        ws = self._ws
 
         msg_id = self._msg_id
         self._msg_id += 1
 
         msg = {"id": msg_id, "type": msg_type, **kwargs}
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = fut
 
         try:
-            await self._ws.send(json.dumps(msg))
-
-            # Read responses until we get our result
-            while True:
-                raw = await asyncio.wait_for(self._ws.recv(), timeout=self.timeout)
-                data = json.loads(raw)
-
-                if data.get("type") == "result" and data.get("id") == msg_id:
-                    if data.get("success"):
-                        return data.get("result")
-                    error = data.get("error", {})
-                    raise RuntimeError(
-                        f"HA error {error.get('code', '?')}: {error.get('message', '?')}"
-                    )
-                # Skip events and other messages
+            if ws is None:
+                raise ConnectionError("Not connected to Home Assistant")
+            await ws.send(_dumps(msg))
+
+            # The reader resolves the future once the matching result arrives; events and
+            # results for other requests never pass through here.
+            data = await asyncio.wait_for(fut, timeout=self.timeout)
         except TimeoutError:
             raise RuntimeError(f"Timeout waiting for {msg_type}") from None
         except Exception as e:
-            # Connection lost - reset and raise
-            await self._close_ws()
+            # Connection lost - reset and raise. Another request may already have reconnected;
+            # leave that connection alone.
+            if self._ws is ws:
+                await self._close_ws()
             raise RuntimeError(f"WS error during {msg_type}: {e}") from e
+        finally:
+            self._pending.pop(msg_id, None)
+
+        if data.get("success"):
+            return data.get("result")
+        # An error result is an answer like any other; the connection stays usable for the
+        # requests still in flight.
+        error = data.get("error", {})
+        raise RuntimeError(f"HA error {error.get('code', '?')}: {error.get('message', '?')}")
 
     # Registry API wrappers
     async def area_list(self) -> list[dict]:
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Literal
+from typing import Any, Literal, NamedTuple
 
 ActionType = Literal[
     "set_entity_area",
@@ -15,8 +14,7 @@ ActionType = Literal[
 ]
 
 
-@dataclass(frozen=True)
-class Action:
+class Action(NamedTuple):
     id: str
     type: ActionType
     payload: dict[str, Any]
@@ -26,11 +24,4 @@ class Action:
 
 
 def asdict_action(a: Action) -> dict[str, Any]:
-    return {
-        "id": a.id,
-        "type": a.type,
-        "payload": a.payload,
-        "reason": a.reason,
-        "confidence": a.confidence,
-        "requires_approval": a.requires_approval,
-    }
+    return a._asdict()
@@ -1,3 +1,4 @@
+import functools
 import os
 from typing import Any
 
@@ -6,26 +7,23 @@ import yaml
 DEFAULT_RULES_PATH = "/app/config/rules.yaml"
 
 
-def _candidate_paths(explicit_path: str | None) -> list[str]:
-    out: list[str] = []
-    if explicit_path:
-        out.append(explicit_path)
-    out.extend(
-        [
-            "/config/ha_housekeeper/rules.yaml",
-            "/config/ha_housekeeper_rules.yaml",
-            DEFAULT_RULES_PATH,
-        ]
-    )
+# Searched after the explicit path, in this order.
+_DEFAULT_CANDIDATE_PATHS = (
+    "/config/ha_housekeeper/rules.yaml",
+    "/config/ha_housekeeper_rules.yaml",
+    DEFAULT_RULES_PATH,
+)
+
+# path -> ((st_mtime_ns, st_size), rules, meta) of the last parse.
+_RULES_CACHE: dict[str, tuple[tuple[int, int], dict[str, Any], dict[str, Any]]] = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _candidate_paths(explicit_path: str | None) -> tuple[str, ...]:
+    if not explicit_path:
+        return _DEFAULT_CANDIDATE_PATHS
     # de-dup while preserving order
-    seen = set()
-    uniq = []
-    for p in out:
-        if p in seen:
-            continue
-        seen.add(p)
-        uniq.append(p)
-    return uniq
+    return (explicit_path, *(p for p in _DEFAULT_CANDIDATE_PATHS if p != explicit_path))
 
 
 def find_rules_path(explicit_path: str | None = None) -> str | None:
@@ -44,6 +42,24 @@ def load_rules(explicit_path: str | None = None) -> tuple[dict[str, Any], dict[s
     if not path:
         return {}, {"path": None, "error": "No rules file found"}
 
+    # The rules file rarely changes between plans; reuse the last parse while it is untouched.
+    # Callers must treat the returned dicts as read-only.
+    try:
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    cached = _RULES_CACHE.get(path)
+    if key is not None and cached is not None and cached[0] == key:
+        return cached[1], cached[2]
+
+    rules, meta = _parse_rules(path)
+    if key is not None:
+        _RULES_CACHE[path] = (key, rules, meta)
+    return rules, meta
+
+
+def _parse_rules(path: str) -> tuple[dict[str, Any], dict[str, Any]]:
     try:
         with open(path, encoding="utf-8") as f:
             data = yaml.safe_load(f) or {}
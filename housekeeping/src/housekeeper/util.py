@@ -2,17 +2,25 @@ import re
 
 _split_re = re.compile(r"[^a-z0-9]+")
 
+# Byte table mapping everything outside [a-z0-9] to a space, so ASCII input is tokenized with
+# bytes.translate() + split() instead of the regex engine.
+_TOK_TABLE = bytes(c if 97 <= c <= 122 or 48 <= c <= 57 else 32 for c in range(256))
+
 
 def tokenize(s: str) -> set[str]:
     s = (s or "").strip().lower()
     if not s:
         return set()
+    if s.isascii():
+        return set(s.encode().translate(_TOK_TABLE).decode().split())
+    # Non-ASCII letters are separators too; keep the regex for those.
     return {t for t in _split_re.split(s) if t}
 
 
 def is_suffix_duplicate_entity(entity_id: str) -> tuple[bool, str]:
-    # sensor.foo_2 => (True, sensor.foo)
-    m = re.match(r"^(?P<base>.+)_([2-9]|[1-9][0-9]+)$", entity_id)
-    if not m:
+    # sensor.foo_2 => (True, sensor.foo); the suffix is 2-9 or any number from 10 without
+    # leading zeros.
+    base, _, tail = entity_id.rpartition("_")
+    if not base or not tail.isascii() or not tail.isdigit() or tail[0] == "0" or tail == "1":
         return (False, entity_id)
-    return (True, m.group("base"))
+    return (True, base)
@@ -22,13 +22,10 @@ def main() -> int:
         final = cropped.resize((1024, 1024), resample=Image.Resampling.LANCZOS)
         final.save(tmp_path, format="PNG")
 
-    tmp_path.replace(out_path)
+    # Write the www copy from the in-memory image instead of decoding the saved file again.
     out_www.parent.mkdir(parents=True, exist_ok=True)
-    final_copy = Image.open(out_path)
-    try:
-        final_copy.save(out_www, format="PNG")
-    finally:
-        final_copy.close()
+    final.save(out_www, format="PNG")
+    tmp_path.replace(out_path)
 
     return 0
 
@@ -11,8 +11,11 @@ def _smart_crop_box(im: Image.Image, threshold: int = 60) -> tuple[int, int, int
     Works well for dark backgrounds with a bright mark (like the current HomeVox logo).
     """
     g = ImageOps.grayscale(im)
-    # Binary mask: 255 where pixel is "bright", else 0.
-    m = g.point(lambda p: 255 if p >= threshold else 0, mode="L")
+    # Binary mask: 255 where pixel is "bright", else 0. Passing the lookup table directly
+    # skips PIL calling a Python function for each of the 256 levels.
+    threshold = max(0, min(256, threshold))
+    lut = [0] * threshold + [255] * (256 - threshold)
+    m = g.point(lut, mode="L")
     bbox = m.getbbox()
     return bbox
 
@@ -47,9 +50,10 @@ def main() -> int:
         final = cropped.resize((1024, 1024), resample=Image.Resampling.LANCZOS)
         final.save(tmp_path, format="PNG")
 
-    tmp_path.replace(out_path)
+    # Write the www copy from the in-memory image instead of decoding the saved file again.
     out_www.parent.mkdir(parents=True, exist_ok=True)
-    Image.open(out_path).save(out_www, format="PNG")
+    final.save(out_www, format="PNG")
+    tmp_path.replace(out_path)
     return 0
 
 